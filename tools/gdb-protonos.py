@@ -12,11 +12,13 @@ This script automates loading kernel symbols at the correct address by:
 Usage in GDB:
   source tools/gdb-protonos.py
   proton-connect        # Connect to QEMU and load symbols automatically
+                        # (--async: leave the kernel running once symbols are loaded)
   proton-load-symbols   # Just load symbols (if already connected and base known)
   proton-jit-enable     # Enable JIT symbol debugging (after symbols loaded)
 """
 
 import gdb
+import functools
 import tempfile
 import os
 import struct
@@ -26,11 +28,43 @@ GDB_DEBUG_MARKER_ADDR = 0x10000
 GDB_DEBUG_IMAGEBASE_ADDR = 0x10008
 GDB_DEBUG_MARKER_VALUE = 0xDEADBEEF
 PE_IMAGE_BASE = 0x140000000  # Expected base in the PE header
+_SCAN_CHUNK = 0x100000  # Bytes per read_memory call when scanning for the MZ header
+_WARMUP_DELAYS = (0, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 4.0)  # Backoff while the stub settles
+_JIT_ENTRY_SIZE = 32  # sizeof(jit_code_entry)
+_JIT_PREFETCH_ENTRIES = 16  # Entries to cover per prefetch once the list stride is known
+_JIT_MAX_STRIDE = 0x1000  # Larger gaps between entries aren't worth predicting
+_ELF_LAZY_READ_MIN = 0x1000  # Smaller ELFs are cheaper to read in one go
+
+# Little-endian field readers: _U64(buf, offset)[0]
+_U16 = struct.Struct('<H').unpack_from
+_U32 = struct.Struct('<I').unpack_from
+_U64 = struct.Struct('<Q').unpack_from
+_U64X2 = struct.Struct('<QQ').unpack_from
+
+# ELF64 on-disk records: Elf64_Shdr (64 bytes) and Elf64_Sym (24 bytes)
+_ELF64_SHDR = struct.Struct('<IIQQQQIIQQ')
+_ELF64_SYM = struct.Struct('<IBBHQQ')
+# Fixed layout of the per-method ELFs built by GdbJitDebug.cs: header, five
+# section headers, then .symtab (null + one function symbol) and .strtab
+_JIT_ELF_SHNUM = 5
+_JIT_ELF_SYMTAB_OFFSET = 64 + _JIT_ELF_SHNUM * _ELF64_SHDR.size
+_JIT_ELF_STRTAB_OFFSET = _JIT_ELF_SYMTAB_OFFSET + 2 * _ELF64_SYM.size
+_JIT_ELF_STRTAB_SHDR = 64 + 3 * _ELF64_SHDR.size
+_SHDR_TYPE_TO_SIZE = struct.Struct('<IQQQQ').unpack_from  # sh_type .. sh_size
+
+# AOT symbol file, resolved against the repo root (tools/..) rather than GDB's CWD
+try:
+    _REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+except NameError:
+    _REPO_ROOT = os.getcwd()  # __file__ isn't set when pasted into a python block
+KERNEL_SYMS = os.path.join(_REPO_ROOT, 'build', 'x64', 'kernel_syms.elf')
 
 # Global state for symbol offset and JIT tracking
 _symbol_offset = 0
 _jit_symbols = {}  # elf_addr -> info dict
+_elf_parse_cache = {}  # (elf_addr, elf_size) -> (name, code_addr)
 _temp_dir = None
+_loaded_symbols_key = None  # (mtime, offset) of the loaded kernel symbol file
 
 def get_temp_dir():
     """Get or create temp directory for JIT ELF files."""
@@ -39,10 +73,122 @@ def get_temp_dir():
         _temp_dir = tempfile.mkdtemp(prefix='protonos_jit_')
     return _temp_dir
 
+@functools.lru_cache(maxsize=1)
+def _read_debug_block():
+    """Read (marker, ImageBase) in one 16-byte fetch, memoized until target state changes."""
+    buf = gdb.selected_inferior().read_memory(GDB_DEBUG_MARKER_ADDR, 16)
+    return _U64X2(buf)
+
+def _invalidate_read_cache(event):
+    """Drop memoized target reads whenever target state may have changed."""
+    _read_debug_block.cache_clear()
+
+gdb.events.stop.connect(_invalidate_read_cache)
+gdb.events.cont.connect(_invalidate_read_cache)
+gdb.events.memory_changed.connect(_invalidate_read_cache)
+gdb.events.exited.connect(_invalidate_read_cache)  # Also fired by disconnect and kill
+
+@functools.lru_cache(maxsize=1)
+def _jit_descriptor_addr():
+    """Address of __proton_jit_descriptor, memoized until the loaded symbols change."""
+    return int(gdb.parse_and_eval("(unsigned long long)&__proton_jit_descriptor"))
+
+def _invalidate_symbol_cache(event):
+    """Drop memoized symbol lookups when objfiles are added or removed."""
+    _jit_descriptor_addr.cache_clear()
+
+gdb.events.new_objfile.connect(_invalidate_symbol_cache)
+gdb.events.clear_objfiles.connect(_invalidate_symbol_cache)
+
+def _forget_jit_state():
+    """Drop JIT symbols and parsed ELFs from a previous boot; their addresses get reused."""
+    global _jit_symbols
+    _jit_symbols = {}
+    _elf_parse_cache.clear()
+
+def _read_pc():
+    """Read RIP from the selected frame without going through the expression parser."""
+    return int(gdb.selected_frame().read_register('rip'))
+
+def _emit(lines):
+    """Write buffered status lines to GDB's stdout in one call and reset the buffer."""
+    gdb.write("".join(line + "\n" for line in lines), gdb.STDOUT)
+    gdb.flush()
+    lines.clear()
+
 def read_memory(addr, size):
-    """Read memory from target as bytes."""
+    """Read memory from target as a memoryview over GDB's buffer (no copy)."""
     inferior = gdb.selected_inferior()
-    return bytes(inferior.read_memory(addr, size))
+    return memoryview(inferior.read_memory(addr, size))
+
+def _symbol_file_loaded(path):
+    """Check whether GDB still has an objfile for the given symbol file."""
+    return any(o.filename == path for o in gdb.objfiles())
+
+def load_kernel_symbols(offset):
+    """Load the AOT kernel symbols relocated by the given offset.
+
+    Returns False without touching GDB if the same (unchanged) symbol file
+    is already loaded at this offset.
+    """
+    global _loaded_symbols_key
+    if not os.path.exists(KERNEL_SYMS):
+        raise gdb.GdbError(f"[ProtonOS] {KERNEL_SYMS} not found - run ./build.sh first")
+
+    key = (os.path.getmtime(KERNEL_SYMS), offset)
+    if key == _loaded_symbols_key and _symbol_file_loaded(KERNEL_SYMS):
+        return False
+
+    gdb.execute(f"add-symbol-file {KERNEL_SYMS} -o {offset}")
+    _loaded_symbols_key = key
+    return True
+
+def _read_scan_window(read, lo, hi, min_chunk=0x10000):
+    """Read [lo, hi) as a sorted list of (start, bytes) pieces, skipping unreadable ranges.
+
+    Reads _SCAN_CHUNK bytes per call and splits a failing chunk in halves down
+    to min_chunk, so one unmapped page doesn't hide the rest of the window.
+    """
+    pieces = []
+
+    def read_piece(start, end):
+        try:
+            pieces.append((start, bytes(read(start, end - start))))
+        except gdb.error:
+            if end - start > min_chunk:
+                mid = start + (end - start) // 2
+                read_piece(start, mid)
+                read_piece(mid, end)
+
+    for start in range(lo, hi, _SCAN_CHUNK):
+        read_piece(start, min(start + _SCAN_CHUNK, hi))
+    return pieces
+
+def _looks_like_pe(data, pos):
+    """Check that the MZ header at data[pos] has a sane e_lfanew pointing at a PE signature."""
+    if pos + 0x40 > len(data):
+        return False
+    e_lfanew = _U32(data, pos + 0x3c)[0]
+    if e_lfanew < 0x40 or e_lfanew > 0x1000 or e_lfanew & 3:
+        return False
+    sig = pos + e_lfanew
+    # A signature past the end of this piece can't be checked; trust e_lfanew alone
+    return sig + 4 > len(data) or data[sig:sig + 4] == b'PE\x00\x00'
+
+def _find_pe_headers(window):
+    """Return the 2KB-aligned addresses in a scanned window that start a plausible PE image.
+
+    Lets bytes.find do the searching instead of slicing every candidate, and
+    drops stray 'MZ' byte pairs in code/data that lack a valid PE header.
+    """
+    hits = set()
+    for start, data in window:
+        pos = data.find(b'MZ')
+        while pos >= 0:
+            if (start + pos) & 0x7FF == 0 and _looks_like_pe(data, pos):
+                hits.add(start + pos)
+            pos = data.find(b'MZ', pos + 1)
+    return hits
 
 def find_kernel_base_by_mz_scan(verbose=False, retries=5):
     """Find the kernel base by scanning for MZ header around the current PC.
@@ -60,26 +206,26 @@ def find_kernel_base_by_mz_scan(verbose=False, retries=5):
     except:
         pass
 
-    # Give QEMU's GDB stub time to fully initialize
-    time.sleep(3.0)
+    # Bind the reader once; the GDB API lookups aren't free inside the loops below
+    read = gdb.selected_inferior().read_memory
 
     # Wait for memory access to become available
-    # This can take a few seconds after connecting to a running QEMU
-    inferior = gdb.selected_inferior()
+    # This can take a few seconds after connecting to a running QEMU, but is
+    # usually immediate - poll with exponential backoff instead of fixed sleeps
     pc = None
     memory_ready = False
-    for warmup in range(10):
+    for warmup, delay in enumerate(_WARMUP_DELAYS):
+        time.sleep(delay)
         try:
-            pc = int(gdb.parse_and_eval("$rip"))
+            pc = _read_pc()
             # Try to actually read memory at PC
-            _ = bytes(inferior.read_memory(pc, 4))
+            read(pc, 4)
             print(f"[ProtonOS] Memory access ready after {warmup+1} warmup attempts (PC={hex(pc)})")
             memory_ready = True
             break
         except Exception as e:
             if warmup == 0:
                 print(f"[ProtonOS] Waiting for memory access... ({e})")
-            time.sleep(0.5)
 
     if not memory_ready:
         print("[ProtonOS] WARNING: Memory access not ready, trying recovery methods...")
@@ -97,8 +243,8 @@ def find_kernel_base_by_mz_scan(verbose=False, retries=5):
                 # Test memory access
                 for i in range(5):
                     try:
-                        pc = int(gdb.parse_and_eval("$rip"))
-                        _ = bytes(inferior.read_memory(pc, 4))
+                        pc = _read_pc()
+                        read(pc, 4)
                         print(f"[ProtonOS] Memory access recovered (PC={hex(pc)})")
                         memory_ready = True
                         break
@@ -123,9 +269,9 @@ def find_kernel_base_by_mz_scan(verbose=False, retries=5):
 
                     for i in range(5):
                         try:
-                            pc = int(gdb.parse_and_eval("$rip"))
-                            inferior = gdb.selected_inferior()
-                            _ = bytes(inferior.read_memory(pc, 4))
+                            pc = _read_pc()
+                            read = gdb.selected_inferior().read_memory
+                            read(pc, 4)
                             print(f"[ProtonOS] Memory access recovered after reconnect (PC={hex(pc)})")
                             memory_ready = True
                             break
@@ -141,12 +287,12 @@ def find_kernel_base_by_mz_scan(verbose=False, retries=5):
         print("[ProtonOS] ERROR: Memory access unavailable after all recovery attempts")
 
     for attempt in range(retries):
-        # Delay before each attempt - increases with retries
-        delay = 1.0 + (attempt * 1.0)
-        time.sleep(delay)
+        # Delay before each retry - increases with retries
+        if attempt > 0:
+            time.sleep(attempt * 1.0)
 
         try:
-            pc = int(gdb.parse_and_eval("$rip"))
+            pc = _read_pc()
         except Exception as e:
             if verbose:
                 print(f"[ProtonOS] Attempt {attempt+1}: Could not read PC: {e}")
@@ -156,9 +302,8 @@ def find_kernel_base_by_mz_scan(verbose=False, retries=5):
             print(f"[ProtonOS] Attempt {attempt+1}: Scanning around PC={hex(pc)}")
 
         # First verify we can read memory at PC - if not, memory access is broken
-        inferior = gdb.selected_inferior()
         try:
-            _ = bytes(inferior.read_memory(pc, 4))
+            read(pc, 4)
         except:
             if verbose:
                 print(f"[ProtonOS] Attempt {attempt+1}: Can't read memory at PC, retrying...")
@@ -177,15 +322,27 @@ def find_kernel_base_by_mz_scan(verbose=False, retries=5):
             pc_64k - 0x10000,         # One 64KB segment below
         ]
 
-        inferior = gdb.selected_inferior()
+        priority_bases = [pbase for pbase in priority_bases if pbase > 0]
+
+        # One read covering every priority base's headers; per-base reads only if part
+        # of that span isn't mapped. A bare 'MZ' is common inside kernel code, so each hit
+        # still has to pass _looks_like_pe (e_lfanew can reach 0x1000 past the base).
+        lo = min(priority_bases, default=0)
+        hi = max(priority_bases, default=0) + 0x1004
+        try:
+            span = read(lo, hi - lo) if priority_bases else b''
+        except gdb.MemoryError:
+            span = None
+
         for pbase in priority_bases:
-            if pbase <= 0:
-                continue
             try:
-                data = bytes(inferior.read_memory(pbase, 2))
+                if span is not None:
+                    data, pos = span, pbase - lo
+                else:
+                    data, pos = read(pbase, 0x40), 0
                 if verbose:
-                    print(f"[ProtonOS] Priority check {hex(pbase)}: {data.hex()}")
-                if data == b'MZ':
+                    print(f"[ProtonOS] Priority check {hex(pbase)}: {bytes(data[pos:pos + 2]).hex()}")
+                if data[pos:pos + 2] == b'MZ' and _looks_like_pe(data, pos):
                     print(f"[ProtonOS] Found MZ at priority address {hex(pbase)}")
                     return pbase
             except:
@@ -193,46 +350,47 @@ def find_kernel_base_by_mz_scan(verbose=False, retries=5):
 
         # Search a wide range: ±4MB in 64KB steps
         # Also check 4KB aligned addresses near the PC
-        potential_bases = []
+        # (a set, so overlapping grids dedupe in O(1) instead of a linear 'in' per address)
+        potential_bases = set()
 
         # First try likely PE alignments: 64KB, 4KB, and 2KB aligned
-        for offset in range(-0x400000, 0x400000, 0x10000):  # ±4MB in 64KB steps
-            potential_bases.append(pc_64k + offset)
+        potential_bases.update(pc_64k + offset for offset in range(-0x400000, 0x400000, 0x10000))  # ±4MB in 64KB steps
 
         # 4KB aligned addresses near PC
-        for offset in range(-0x100000, 0x100000, 0x1000):  # ±1MB in 4KB steps
-            addr = (pc & ~0xFFF) + offset
-            if addr not in potential_bases:
-                potential_bases.append(addr)
+        potential_bases.update(pc_4k + offset for offset in range(-0x100000, 0x100000, 0x1000))  # ±1MB in 4KB steps
 
         # Also check 2KB aligned addresses close to PC (UEFI can use unusual alignment)
-        for offset in range(-0x40000, 0x40000, 0x800):  # ±256KB in 2KB steps
-            addr = (pc & ~0x7FF) + offset
-            if addr not in potential_bases:
-                potential_bases.append(addr)
+        potential_bases.update((pc & ~0x7FF) + offset for offset in range(-0x40000, 0x40000, 0x800))  # ±256KB in 2KB steps
 
-        # Remove duplicates and sort by distance from PC
-        potential_bases = list(set(potential_bases))
-        potential_bases.sort(key=lambda x: abs(x - pc))
+        # Sort by distance from PC (the set already removed duplicates)
+        potential_bases = sorted(potential_bases, key=lambda x: abs(x - pc))
 
-        inferior = gdb.selected_inferior()
+        # Read the ±4MB window one chunk at a time, each only when the nearest unchecked
+        # candidate falls in it, so a kernel close to the PC costs one or two reads
+        lo = max(pc_64k - 0x400000, 0)
+        hi = pc_64k + 0x400000
+        chunks = {}  # chunk index -> readable (start, bytes) pieces
+        pe_headers = set()
         checked = 0
         errors = 0
 
         for base in potential_bases:
             if base <= 0:
                 continue
-            try:
-                data = bytes(inferior.read_memory(base, 2))
-                checked += 1
-                if data == b'MZ':
-                    if verbose:
-                        print(f"[ProtonOS] Found MZ at {hex(base)} after checking {checked} addresses")
-                    return base
-            except gdb.MemoryError:
-                errors += 1
-            except Exception as e:
-                errors += 1
+            n = (base - lo) // _SCAN_CHUNK
+            pieces = chunks.get(n)
+            if pieces is None:
+                chunk_start = lo + n * _SCAN_CHUNK
+                pieces = chunks[n] = _read_scan_window(read, chunk_start, min(chunk_start + _SCAN_CHUNK, hi))
+                pe_headers |= _find_pe_headers(pieces)
+            if not any(start <= base and base + 2 <= start + len(data) for start, data in pieces):
+                errors += 1  # Not in any readable piece
+                continue
+            checked += 1
+            if base in pe_headers:
+                if verbose:
+                    print(f"[ProtonOS] Found MZ at {hex(base)} after checking {checked} addresses")
+                return base
 
         if verbose:
             print(f"[ProtonOS] Attempt {attempt+1}: Checked {checked} addresses, {errors} errors")
@@ -251,64 +409,151 @@ def find_kernel_base_by_mz_scan(verbose=False, retries=5):
         print(f"[ProtonOS] No MZ header found after {retries} attempts")
     return None
 
-def parse_elf_symbol(elf_data):
-    """Parse a minimal ELF to extract the function symbol name and address."""
-    # Check ELF magic
-    if elf_data[:4] != b'\x7fELF':
-        return None, None
-
-    # ELF64 header: e_shoff at offset 40 (8 bytes)
-    e_shoff = struct.unpack('<Q', elf_data[40:48])[0]
-    e_shnum = struct.unpack('<H', elf_data[60:62])[0]
-    e_shstrndx = struct.unpack('<H', elf_data[62:64])[0]
-
-    # Find .symtab and .strtab sections
+def _strtab_name(elf_data, strtab_offset, strtab_size, st_name):
+    """Read a null-terminated name from the strtab section of an ELF image."""
+    # Only the strtab is copied out, so elf_data can be a memoryview over
+    # GDB's buffer
+    strtab = bytes(elf_data[strtab_offset:strtab_offset + strtab_size])
+    end = strtab.find(b'\x00', st_name)
+    if end < 0:
+        end = len(strtab)
+    return strtab[st_name:end].decode('utf-8', errors='replace')
+
+def _parse_jit_elf_symbol(elf_data):
+    """Fast path for the kernel's JIT ELF layout; returns None if it doesn't match."""
+    if len(elf_data) < _JIT_ELF_STRTAB_OFFSET:
+        return None
+    # .strtab section header: sh_type, sh_flags, sh_addr, sh_offset, sh_size
+    sh_type, _, _, sh_offset, sh_size = _SHDR_TYPE_TO_SIZE(elf_data, _JIT_ELF_STRTAB_SHDR + 4)
+    if sh_type != 3 or sh_offset != _JIT_ELF_STRTAB_OFFSET:
+        return None
+    st_name, st_info, _, _, st_value, _ = _ELF64_SYM.unpack_from(elf_data, _JIT_ELF_SYMTAB_OFFSET + _ELF64_SYM.size)
+    if st_info & 0xf != 2:  # STT_FUNC
+        return None
+    return _strtab_name(elf_data, sh_offset, sh_size, st_name), st_value
+
+def _elf_symbol_sections(shdrs):
+    """Find (symtab_offset, symtab_size, strtab_offset, strtab_size) in a section header table."""
     symtab_offset = None
     symtab_size = None
     strtab_offset = None
+    strtab_size = None
 
-    for i in range(e_shnum):
-        shdr_off = e_shoff + i * 64
-        sh_type = struct.unpack('<I', elf_data[shdr_off+4:shdr_off+8])[0]
-        sh_offset = struct.unpack('<Q', elf_data[shdr_off+24:shdr_off+32])[0]
-        sh_size = struct.unpack('<Q', elf_data[shdr_off+32:shdr_off+40])[0]
-
+    # Unpack the whole section header table in one pass
+    for _, sh_type, _, _, sh_offset, sh_size, _, _, _, _ in _ELF64_SHDR.iter_unpack(shdrs):
         if sh_type == 2:  # SHT_SYMTAB
             symtab_offset = sh_offset
             symtab_size = sh_size
         elif sh_type == 3 and strtab_offset is None:  # SHT_STRTAB (first one is usually strtab)
             strtab_offset = sh_offset
+            strtab_size = sh_size
 
     if symtab_offset is None or strtab_offset is None:
-        return None, None
-
-    # Parse symbol table (skip null symbol at index 0)
-    num_symbols = symtab_size // 24
-    for i in range(1, num_symbols):
-        sym_off = symtab_offset + i * 24
-        st_name = struct.unpack('<I', elf_data[sym_off:sym_off+4])[0]
-        st_info = elf_data[sym_off+4]
-        st_value = struct.unpack('<Q', elf_data[sym_off+8:sym_off+16])[0]
+        return None
+    return symtab_offset, symtab_size, strtab_offset, strtab_size
 
+def _first_func_symbol(syms):
+    """Return (st_name, st_value) of the first STT_FUNC entry in packed symbols."""
+    for st_name, st_info, _, _, st_value, _ in _ELF64_SYM.iter_unpack(syms):
         # Get symbol type (lower 4 bits)
         sym_type = st_info & 0xf
         if sym_type == 2:  # STT_FUNC
-            # Read null-terminated string from strtab
-            name_bytes = []
-            idx = strtab_offset + st_name
-            while idx < len(elf_data) and elf_data[idx] != 0:
-                name_bytes.append(elf_data[idx])
-                idx += 1
-            name = bytes(name_bytes).decode('utf-8', errors='replace')
-            return name, st_value
+            return st_name, st_value
+    return None
+
+def parse_elf_symbol(elf_data):
+    """Parse a minimal ELF to extract the function symbol name and address."""
+    # Check ELF magic
+    if elf_data[:4] != b'\x7fELF':
+        return None, None
+
+    # ELF64 header: e_shoff at offset 40 (8 bytes)
+    e_shoff = _U64(elf_data, 40)[0]
+    e_shnum = _U16(elf_data, 60)[0]
+    e_shstrndx = _U16(elf_data, 62)[0]
+
+    # JIT-emitted ELFs all share one layout; skip the section header walk
+    if e_shoff == 64 and e_shnum == _JIT_ELF_SHNUM:
+        result = _parse_jit_elf_symbol(elf_data)
+        if result is not None:
+            return result
+
+    # Find .symtab and .strtab sections
+    sections = _elf_symbol_sections(elf_data[e_shoff:e_shoff + e_shnum * _ELF64_SHDR.size])
+    if sections is None:
+        return None, None
+    symtab_offset, symtab_size, strtab_offset, strtab_size = sections
+
+    # Parse symbol table (skip null symbol at index 0)
+    num_symbols = symtab_size // _ELF64_SYM.size
+    sym = _first_func_symbol(elf_data[symtab_offset + _ELF64_SYM.size:symtab_offset + num_symbols * _ELF64_SYM.size])
+    if sym is None:
+        return None, None
+    st_name, st_value = sym
+    return _strtab_name(elf_data, strtab_offset, strtab_size, st_name), st_value
+
+def read_elf_symbol(elf_addr, elf_size):
+    """Read the function symbol name and address of an ELF image in target memory.
+
+    Small images are read whole. Larger ones are read lazily: the header, then
+    the section header table, then only the .symtab and .strtab contents, so
+    .text and debug sections never cross the wire.
+    """
+    if elf_size <= _ELF_LAZY_READ_MIN:
+        return parse_elf_symbol(read_memory(elf_addr, elf_size))
+
+    ehdr = read_memory(elf_addr, 64)
+    if ehdr[:4] != b'\x7fELF':
+        return None, None
+    e_shoff = _U64(ehdr, 40)[0]
+    e_shnum = _U16(ehdr, 60)[0]
+
+    sections = _elf_symbol_sections(read_memory(elf_addr + e_shoff, e_shnum * _ELF64_SHDR.size))
+    if sections is None:
+        return None, None
+    symtab_offset, symtab_size, strtab_offset, strtab_size = sections
 
-    return None, None
+    # Skip null symbol at index 0
+    num_symbols = symtab_size // _ELF64_SYM.size
+    if num_symbols < 2:
+        return None, None
+    sym = _first_func_symbol(read_memory(elf_addr + symtab_offset + _ELF64_SYM.size,
+                                         (num_symbols - 1) * _ELF64_SYM.size))
+    if sym is None:
+        return None, None
+    st_name, st_value = sym
+    strtab = read_memory(elf_addr + strtab_offset, strtab_size)
+    return _strtab_name(strtab, 0, strtab_size, st_name), st_value
+
+def _prefetch_jit_entries(read, entry, span=0):
+    """Read the jit_code_entry at `entry` together with memory below it.
+
+    The kernel bump-allocates entries and pushes each onto the list head, so the
+    walk visits descending addresses and the next few entries usually sit just
+    below the current one. `span` is how far below to read, predicted from the
+    stride between recent entries; without a prediction (or if that range isn't
+    readable) the rest of the entry's page is used. Returns (base, data) for
+    the memory actually read.
+    """
+    end = entry + _JIT_ENTRY_SIZE
+    page_base = entry & ~0xFFF
+    bases = [page_base]
+    if entry - span < page_base:
+        bases.insert(0, max(entry - span, 0))
+    for base in bases:
+        try:
+            return base, memoryview(read(base, end - base))
+        except gdb.MemoryError:
+            pass
+    return entry, memoryview(read(entry, _JIT_ENTRY_SIZE))
 
 def _scan_jit_list(verbose=False):
     """Walk the JIT linked list and collect all registered methods.
 
     This is called on-demand when the user wants to see JIT methods,
     rather than using a breakpoint during execution (which is slow).
+    Symbol names are resolved during the walk; entries whose ELF can't be
+    read yet are retried on demand by search/load.
 
     Note: Some memory regions (especially low addresses <1MB) may not be
     accessible via GDB. The scan will collect what it can and report
@@ -322,17 +567,19 @@ def _scan_jit_list(verbose=False):
     total_count = 0
 
     try:
+        read = gdb.selected_inferior().read_memory  # Bound once for the whole walk
+
         # Get first_entry from descriptor
-        desc_addr = int(gdb.parse_and_eval("(unsigned long long)&__proton_jit_descriptor"))
+        desc_addr = _jit_descriptor_addr()
         if verbose:
             print(f"[ProtonOS] Descriptor at {hex(desc_addr)}")
 
         # Read all 24 bytes of descriptor at once
-        desc_data = read_memory(desc_addr, 24)
-        version = struct.unpack('<I', desc_data[0:4])[0]
-        action = struct.unpack('<I', desc_data[4:8])[0]
-        relevant_entry = struct.unpack('<Q', desc_data[8:16])[0]
-        first_entry = struct.unpack('<Q', desc_data[16:24])[0]
+        desc_data = bytes(read(desc_addr, 24))
+        version = _U32(desc_data)[0]
+        action = _U32(desc_data, 4)[0]
+        relevant_entry = _U64(desc_data, 8)[0]
+        first_entry = _U64(desc_data, 16)[0]
 
         if verbose:
             print(f"[ProtonOS] version={version} action={action}")
@@ -346,6 +593,8 @@ def _scan_jit_list(verbose=False):
         # Walk the linked list
         entry = first_entry
         visited = set()  # Prevent infinite loops
+        window_base, window = 0, b''  # Prefetched memory that upcoming entries are served from
+        last_entry = 0
 
         while entry != 0:
             if entry in visited:
@@ -364,23 +613,40 @@ def _scan_jit_list(verbose=False):
 
             try:
                 # Read jit_code_entry: next(8) + prev(8) + symfile_addr(8) + symfile_size(8)
-                entry_data = read_memory(entry, 32)
-                next_entry = struct.unpack('<Q', entry_data[0:8])[0]
-                prev_entry = struct.unpack('<Q', entry_data[8:16])[0]
-                symfile_addr = struct.unpack('<Q', entry_data[16:24])[0]
-                symfile_size = struct.unpack('<Q', entry_data[24:32])[0]
+                off = entry - window_base
+                if off < 0 or off + _JIT_ENTRY_SIZE > len(window):
+                    # Size the next window to cover the following entries at the observed stride
+                    stride = last_entry - entry
+                    span = stride * _JIT_PREFETCH_ENTRIES if 0 < stride <= _JIT_MAX_STRIDE else 0
+                    window_base, window = _prefetch_jit_entries(read, entry, span)
+                    off = entry - window_base
+                last_entry = entry
+                next_entry = _U64(window, off)[0]
+                prev_entry = _U64(window, off + 8)[0]
+                symfile_addr = _U64(window, off + 16)[0]
+                symfile_size = _U64(window, off + 24)[0]
 
                 if verbose and total_count <= 5:
                     print(f"[ProtonOS] Entry {total_count}: addr={hex(entry)} next={hex(next_entry)} elf={hex(symfile_addr)} size={symfile_size}")
 
                 if symfile_addr != 0 and symfile_size != 0 and symfile_size < 0x100000:
-                    _jit_symbols[symfile_addr] = {
+                    info = {
                         'elf_addr': symfile_addr,
                         'elf_size': symfile_size,
                         'loaded': False,
                         'name': None,
                         'code_addr': None
                     }
+                    # Resolve now while the target is paused anyway, so later
+                    # searches/loads don't need another round of ELF reads. The
+                    # ELF is allocated right before its entry, so it's usually
+                    # already in the prefetched window.
+                    elf_off = symfile_addr - window_base
+                    if 0 <= elf_off and elf_off + symfile_size <= len(window):
+                        _resolve_jit_symbol(info, window[elf_off:elf_off + symfile_size])
+                    else:
+                        _resolve_jit_symbol(info)
+                    _jit_symbols[symfile_addr] = info
 
                 entry = next_entry
 
@@ -412,54 +678,111 @@ def _scan_jit_list(verbose=False):
 
     return len(_jit_symbols)
 
-class ProtonConnectCommand(gdb.Command):
-    """Connect to QEMU and automatically load ProtonOS kernel symbols."""
+class _MarkerWatchpoint(gdb.Breakpoint):
+    """Internal watchpoint on the debug marker that only stops once the magic value is written.
+
+    Internal so it stays out of 'info breakpoints' and is untouched by the user's breakpoints.
+    proton-connect requires GDB to back it with a debug register (QEMU's stub supports Z2), so
+    the kernel runs at full speed until the write instead of being single-stepped. A breakpoint on the writing
+    function isn't an option: its address is only known once the ImageBase has been read.
+    """
 
     def __init__(self):
-        super().__init__("proton-connect", gdb.COMMAND_USER)
+        super().__init__(f"*(unsigned long long*){GDB_DEBUG_MARKER_ADDR}",
+                         type=gdb.BP_WATCHPOINT, wp_class=gdb.WP_WRITE, internal=True)
+        self.image_base = None
 
-    def invoke(self, arg, from_tty):
-        port = arg.strip() if arg.strip() else "1234"
+    def stop(self):
+        buf = gdb.selected_inferior().read_memory(GDB_DEBUG_MARKER_ADDR, 16)
+        marker, base = _U64X2(buf)
+        if marker != GDB_DEBUG_MARKER_VALUE:
+            return False
+        self.image_base = base
+        return True
 
-        print(f"[ProtonOS] Connecting to QEMU on localhost:{port}...")
-        gdb.execute(f"target remote localhost:{port}")
+class ProtonConnectCommand(gdb.Command):
+    """Connect to QEMU and automatically load ProtonOS kernel symbols.
 
-        print("[ProtonOS] Setting watchpoint on debug marker (0x10000)...")
-        gdb.execute(f"watch *(unsigned long long*){GDB_DEBUG_MARKER_ADDR}")
+    Usage: proton-connect [port] [--async]
+      --async  Resume the kernel with 'continue &' once symbols are loaded
+    """
 
-        print("[ProtonOS] Continuing until kernel writes debug marker...")
-        gdb.execute("continue")
+    def __init__(self):
+        super().__init__("proton-connect", gdb.COMMAND_USER)
 
-        # Check if we hit the watchpoint
-        marker = int(gdb.parse_and_eval(f"*(unsigned long long*){GDB_DEBUG_MARKER_ADDR}"))
-        if marker != GDB_DEBUG_MARKER_VALUE:
-            print(f"[ProtonOS] Warning: Marker value is {hex(marker)}, expected {hex(GDB_DEBUG_MARKER_VALUE)}")
+    def invoke(self, arg, from_tty):
+        argv = gdb.string_to_argv(arg)
+        background = "--async" in argv
+        ports = [a for a in argv if a != "--async"]
+        port = ports[0] if ports else "1234"
+
+        # Shown before connecting: 'target remote' can block for the whole remote timeout
+        _emit([f"[ProtonOS] Connecting to QEMU on localhost:{port}..."])
+        out = []
+        # All setup goes through the command interpreter in one call
+        gdb.execute("\n".join([
+            "set pagination off",
+            "set breakpoint pending on",
+            f"target remote localhost:{port}",
+        ]), to_string=True)
+
+        out.append("[ProtonOS] Setting watchpoint on debug marker (0x10000)...")
+        wp = _MarkerWatchpoint()
+        if wp.type != gdb.BP_HARDWARE_WATCHPOINT:
+            # A software watchpoint would single-step the whole boot up to the marker write
+            wp.delete()
+            _emit(out)
+            raise gdb.GdbError("[ProtonOS] No hardware watchpoint available for the debug marker "
+                               "(check 'show can-use-hw-watchpoints')")
+
+        out.append("[ProtonOS] Continuing until kernel writes debug marker...")
+        _emit(out)
+        try:
+            # A plain continue is already a single stop reply: the hardware watchpoint is the only
+            # thing that stops the target. Range stepping (vCont;r) would not help here - QEMU's stub
+            # doesn't implement it, and the marker-writing PC is unknown until the ImageBase is read.
+            gdb.execute("continue")
+        finally:
+            # Remove only our watchpoint - even on Ctrl-C or a dropped connection - so the
+            # user's breakpoints survive and a re-run doesn't stack up stale watchpoints
+            if wp.is_valid():
+                wp.delete()
+
+        # The watchpoint captured the ImageBase when it saw the marker
+        actual_base = wp.image_base
+        if actual_base is None:
+            marker, _ = _read_debug_block()
+            out.append(f"[ProtonOS] Warning: Marker value is {hex(marker)}, expected {hex(GDB_DEBUG_MARKER_VALUE)}")
+            _emit(out)
             return
 
-        # Read the actual image base
-        actual_base = int(gdb.parse_and_eval(f"*(unsigned long long*){GDB_DEBUG_IMAGEBASE_ADDR}"))
-        print(f"[ProtonOS] Kernel loaded at: {hex(actual_base)}")
+        out.append(f"[ProtonOS] Kernel loaded at: {hex(actual_base)}")
+        _forget_jit_state()
 
         # Calculate offset
         offset = actual_base - PE_IMAGE_BASE
-        print(f"[ProtonOS] Symbol offset: {hex(offset)}")
-
-        # Delete the watchpoint (it served its purpose)
-        gdb.execute("delete")
-
-        # Load symbols with offset
-        print("[ProtonOS] Loading AOT symbols...")
-        gdb.execute(f"add-symbol-file build/x64/kernel_syms.elf -o {offset}")
+        out.append(f"[ProtonOS] Symbol offset: {hex(offset)}")
 
         # Save offset for JIT symbol support
         global _symbol_offset
         _symbol_offset = offset
 
-        print("[ProtonOS] AOT symbols loaded! You can now set breakpoints by function name.")
-        print("[ProtonOS] Example: break kernel_ProtonOS_Kernel__Main")
-        print("[ProtonOS] ")
-        print("[ProtonOS] JIT: After tests run, use 'proton-jit-scan' to find JIT methods.")
-        print("[ProtonOS] JIT methods will have names like: jit_FullTest_Tests__TestMethod")
+        # Load symbols with offset
+        out.append("[ProtonOS] Loading AOT symbols...")
+        _emit(out)
+        if not load_kernel_symbols(offset):
+            out.append("[ProtonOS] AOT symbols already current at this offset.")
+
+        out.append("[ProtonOS] AOT symbols loaded! You can now set breakpoints by function name.")
+        out.append("[ProtonOS] Example: break kernel_ProtonOS_Kernel__Main")
+        out.append("[ProtonOS] ")
+        out.append("[ProtonOS] JIT: After tests run, use 'proton-jit-scan' to find JIT methods.")
+        out.append("[ProtonOS] JIT methods will have names like: jit_FullTest_Tests__TestMethod")
+        _emit(out)
+
+        if background:
+            _emit(["[ProtonOS] Resuming kernel in the background..."])
+            gdb.execute("continue &")
 
 class ProtonLoadSymbolsCommand(gdb.Command):
     """Load ProtonOS symbols using the ImageBase already written to memory."""
@@ -471,35 +794,44 @@ class ProtonLoadSymbolsCommand(gdb.Command):
         global _symbol_offset
 
         actual_base = None
+        out = []
 
         # First try reading from low-memory ImageBase variable
         try:
-            actual_base = int(gdb.parse_and_eval(f"*(unsigned long long*){GDB_DEBUG_IMAGEBASE_ADDR}"))
+            _, actual_base = _read_debug_block()
             if actual_base != 0:
-                print(f"[ProtonOS] Found ImageBase in low memory: {hex(actual_base)}")
+                out.append(f"[ProtonOS] Found ImageBase in low memory: {hex(actual_base)}")
         except gdb.error:
             pass
 
         # If that failed, scan for MZ header
         if actual_base is None or actual_base == 0:
-            print("[ProtonOS] Low memory not accessible, scanning for MZ header...")
+            out.append("[ProtonOS] Low memory not accessible, scanning for MZ header...")
+            _emit(out)
             actual_base = find_kernel_base_by_mz_scan(verbose=True)
             if actual_base:
-                print(f"[ProtonOS] Found kernel at {hex(actual_base)} via MZ scan")
+                out.append(f"[ProtonOS] Found kernel at {hex(actual_base)} via MZ scan")
             else:
-                print("[ProtonOS] Could not find kernel base. Target may not be running.")
+                out.append("[ProtonOS] Could not find kernel base. Target may not be running.")
+                _emit(out)
                 return
 
-        print(f"[ProtonOS] Kernel loaded at: {hex(actual_base)}")
+        out.append(f"[ProtonOS] Kernel loaded at: {hex(actual_base)}")
+        # Can't tell a reboot at the same base from the same boot, so start JIT lookups afresh
+        _forget_jit_state()
 
         # Calculate offset
         offset = actual_base - PE_IMAGE_BASE
         _symbol_offset = offset
-        print(f"[ProtonOS] Symbol offset: {hex(offset)}")
+        out.append(f"[ProtonOS] Symbol offset: {hex(offset)}")
+        _emit(out)
 
         # Load symbols with offset
-        gdb.execute(f"add-symbol-file build/x64/kernel_syms.elf -o {offset}")
-        print("[ProtonOS] Symbols loaded!")
+        if load_kernel_symbols(offset):
+            out.append("[ProtonOS] Symbols loaded!")
+        else:
+            out.append("[ProtonOS] Symbols already current at this offset.")
+        _emit(out)
 
 class ProtonInfoCommand(gdb.Command):
     """Show ProtonOS debug info addresses."""
@@ -508,20 +840,22 @@ class ProtonInfoCommand(gdb.Command):
         super().__init__("proton-info", gdb.COMMAND_USER)
 
     def invoke(self, arg, from_tty):
-        print(f"GDB Debug Marker Address:    {hex(GDB_DEBUG_MARKER_ADDR)}")
-        print(f"GDB Debug ImageBase Address: {hex(GDB_DEBUG_IMAGEBASE_ADDR)}")
-        print(f"Expected Marker Value:       {hex(GDB_DEBUG_MARKER_VALUE)}")
-        print(f"PE Image Base (in binary):   {hex(PE_IMAGE_BASE)}")
+        out = [
+            f"GDB Debug Marker Address:    {hex(GDB_DEBUG_MARKER_ADDR)}",
+            f"GDB Debug ImageBase Address: {hex(GDB_DEBUG_IMAGEBASE_ADDR)}",
+            f"Expected Marker Value:       {hex(GDB_DEBUG_MARKER_VALUE)}",
+            f"PE Image Base (in binary):   {hex(PE_IMAGE_BASE)}",
+        ]
 
         try:
-            marker = int(gdb.parse_and_eval(f"*(unsigned long long*){GDB_DEBUG_MARKER_ADDR}"))
-            base = int(gdb.parse_and_eval(f"*(unsigned long long*){GDB_DEBUG_IMAGEBASE_ADDR}"))
-            print(f"\nCurrent Marker Value:        {hex(marker)}")
-            print(f"Current ImageBase:           {hex(base)}")
+            marker, base = _read_debug_block()
+            out.append(f"\nCurrent Marker Value:        {hex(marker)}")
+            out.append(f"Current ImageBase:           {hex(base)}")
             if base != 0:
-                print(f"Required Offset:             {hex(base - PE_IMAGE_BASE)}")
+                out.append(f"Required Offset:             {hex(base - PE_IMAGE_BASE)}")
         except gdb.error:
-            print("\n(Not connected to target)")
+            out.append("\n(Not connected to target)")
+        _emit(out)
 
 class ProtonJitScanCommand(gdb.Command):
     """Scan and list all JIT-compiled methods (requires paused target).
@@ -545,12 +879,90 @@ class ProtonJitScanCommand(gdb.Command):
             return
 
         verbose = "-v" in arg if arg else False
-        print("[ProtonOS] Scanning JIT method list...")
+        out = ["[ProtonOS] Scanning JIT method list..."]
+        _emit(out)
         count = _scan_jit_list(verbose=verbose)
-        print(f"[ProtonOS] Found {count} JIT-compiled methods.")
+        resolved = sum(1 for info in _jit_symbols.values() if info['name'] is not None)
+        out.append(f"[ProtonOS] Found {count} JIT-compiled methods ({resolved} names resolved).")
         if count > 0:
-            print("[ProtonOS] Use 'proton-jit-search <pattern>' to find specific methods.")
-            print("[ProtonOS] Use 'proton-jit-load [pattern]' to load symbols into GDB.")
+            out.append("[ProtonOS] Use 'proton-jit-search <pattern>' to find specific methods.")
+            out.append("[ProtonOS] Use 'proton-jit-load [pattern]' to load symbols into GDB.")
+        _emit(out)
+
+class _JitRegisterBreakpoint(gdb.Breakpoint):
+    """Internal breakpoint on __proton_jit_register that records each new method and resumes.
+
+    stop() pulls the new entry out of the descriptor and returns False, so the kernel never
+    drops to the prompt on a JIT registration. Names are resolved later by search/load.
+    """
+
+    def __init__(self):
+        super().__init__("__proton_jit_register", internal=True)
+        self.silent = True
+        self.hits = 0
+
+    def stop(self):
+        self.hits += 1
+        try:
+            read = gdb.selected_inferior().read_memory
+            desc = read(_jit_descriptor_addr(), 24)
+            action = _U32(desc, 4)[0]
+            entry = _U64(desc, 8)[0]
+            if action != 1 or entry == 0:  # JIT_REGISTER_FN
+                return False
+
+            entry_data = read(entry, _JIT_ENTRY_SIZE)
+            symfile_addr = _U64(entry_data, 16)[0]
+            symfile_size = _U64(entry_data, 24)[0]
+            if symfile_addr != 0 and symfile_size != 0 and symfile_size < 0x100000:
+                _jit_symbols.setdefault(symfile_addr, {
+                    'elf_addr': symfile_addr,
+                    'elf_size': symfile_size,
+                    'loaded': False,
+                    'name': None,
+                    'code_addr': None
+                })
+        except gdb.error:
+            pass
+        return False
+
+_jit_register_bp = None
+
+class ProtonJitEnableCommand(gdb.Command):
+    """Track JIT methods as they are registered, without stopping the target.
+
+    Usage: proton-jit-enable [off]
+
+    Sets an internal breakpoint on __proton_jit_register that records each new
+    method and lets the kernel continue. Costs one debug exception per JIT'd
+    method; use proton-jit-scan instead for a one-off snapshot.
+    """
+
+    def __init__(self):
+        super().__init__("proton-jit-enable", gdb.COMMAND_USER)
+
+    def invoke(self, arg, from_tty):
+        global _jit_register_bp
+
+        if arg.strip() == "off":
+            if _jit_register_bp is not None and _jit_register_bp.is_valid():
+                hits = _jit_register_bp.hits
+                _jit_register_bp.delete()
+                _jit_register_bp = None
+                _emit([f"[ProtonOS] JIT tracking disabled ({hits} registrations seen)."])
+            else:
+                _emit(["[ProtonOS] JIT tracking is not enabled."])
+            return
+
+        if _jit_register_bp is not None and _jit_register_bp.is_valid():
+            _emit(["[ProtonOS] JIT tracking already enabled."])
+            return
+
+        _jit_register_bp = _JitRegisterBreakpoint()
+        _emit([
+            "[ProtonOS] JIT tracking enabled; methods are recorded as they are compiled.",
+            "[ProtonOS] Use 'proton-jit-list' / 'proton-jit-search' after continuing.",
+        ])
 
 class ProtonJitPauseCommand(gdb.Command):
     """Pause the target using QEMU monitor stop command.
@@ -571,17 +983,30 @@ class ProtonJitPauseCommand(gdb.Command):
             print(f"[ProtonOS] Error: {e}")
             print("[ProtonOS] Try: Ctrl-C or set a breakpoint instead.")
 
-def _resolve_jit_symbol(info):
-    """Resolve a JIT symbol's name and code address by reading its ELF data."""
+def _resolve_jit_symbol(info, elf_data=None):
+    """Resolve a JIT symbol's name and code address by reading its ELF data.
+
+    elf_data may be passed in when the caller already holds the ELF bytes.
+    """
     if info['name'] is not None:
         return True  # Already resolved
 
+    # Registered JIT ELFs are immutable, so a previous parse stays valid across rescans
+    key = (info['elf_addr'], info['elf_size'])
+    cached = _elf_parse_cache.get(key)
+    if cached is not None:
+        info['name'], info['code_addr'] = cached
+        return True
+
     try:
-        elf_data = read_memory(info['elf_addr'], info['elf_size'])
-        name, code_addr = parse_elf_symbol(elf_data)
+        if elf_data is None:
+            name, code_addr = read_elf_symbol(info['elf_addr'], info['elf_size'])
+        else:
+            name, code_addr = parse_elf_symbol(elf_data)
         if name and code_addr:
             info['name'] = name
             info['code_addr'] = code_addr
+            _elf_parse_cache[key] = (name, code_addr)
             return True
     except:
         pass
@@ -601,9 +1026,11 @@ class ProtonJitListCommand(gdb.Command):
             print("[ProtonOS] Run 'proton-jit-enable' and continue execution to compile JIT methods.")
             return
 
-        print(f"[ProtonOS] {len(_jit_symbols)} JIT methods captured.")
-        print("[ProtonOS] Use 'proton-jit-load' to load symbols (pauses target).")
-        print("[ProtonOS] Use 'proton-jit-search <pattern>' to find methods.")
+        _emit([
+            f"[ProtonOS] {len(_jit_symbols)} JIT methods captured.",
+            "[ProtonOS] Use 'proton-jit-load' to load symbols (pauses target).",
+            "[ProtonOS] Use 'proton-jit-search <pattern>' to find methods.",
+        ])
 
 class ProtonJitSearchCommand(gdb.Command):
     """Search for JIT methods by pattern. Resolves names on-demand."""
@@ -624,7 +1051,8 @@ class ProtonJitSearchCommand(gdb.Command):
             print("[ProtonOS] Example: proton-jit-search ToString")
             return
 
-        print(f"[ProtonOS] Searching {len(_jit_symbols)} methods for '{pattern}'...")
+        out = [f"[ProtonOS] Searching {len(_jit_symbols)} methods for '{pattern}'..."]
+        _emit(out)
         matches = []
 
         for elf_addr, info in _jit_symbols.items():
@@ -636,12 +1064,14 @@ class ProtonJitSearchCommand(gdb.Command):
                 matches.append((info['code_addr'], info['name'], elf_addr))
 
         if not matches:
-            print("[ProtonOS] No matches found.")
+            out.append("[ProtonOS] No matches found.")
+            _emit(out)
             return
 
-        print(f"[ProtonOS] Found {len(matches)} matches:")
-        for code_addr, name, elf_addr in sorted(matches):
-            print(f"  {hex(code_addr)}: {name}")
+        # One write for the whole listing, however many methods match
+        out.append(f"[ProtonOS] Found {len(matches)} matches:")
+        out.extend(f"  {hex(code_addr)}: {name}" for code_addr, name, elf_addr in sorted(matches))
+        _emit(out)
 
 class ProtonJitLoadCommand(gdb.Command):
     """Load JIT symbols into GDB (requires paused target)."""
@@ -663,6 +1093,7 @@ class ProtonJitLoadCommand(gdb.Command):
         errors = 0
 
         temp_dir = get_temp_dir()
+        pending = []  # (info, elf_path) written to disk, waiting to be loaded
 
         for elf_addr, info in _jit_symbols.items():
             if info['loaded']:
@@ -683,14 +1114,32 @@ class ProtonJitLoadCommand(gdb.Command):
                 elf_path = os.path.join(temp_dir, f"jit_{info['code_addr']:x}.elf")
                 with open(elf_path, 'wb') as f:
                     f.write(elf_data)
-
-                # Load symbol file
-                gdb.execute(f"add-symbol-file {elf_path}", to_string=True)
-                info['loaded'] = True
-                loaded += 1
+                pending.append((info, elf_path))
             except Exception as e:
                 errors += 1
 
+        # Load every symbol file from one sourced script rather than one
+        # gdb.execute round trip per method
+        if pending:
+            script_path = os.path.join(temp_dir, "jit_load.gdb")
+            with open(script_path, 'w') as f:
+                f.writelines(f"add-symbol-file {elf_path}\n" for _, elf_path in pending)
+            try:
+                gdb.execute(f"source {script_path}", to_string=True)
+                for info, _ in pending:
+                    info['loaded'] = True
+                loaded += len(pending)
+            except gdb.error:
+                # A failing line aborts the script; load whatever it didn't reach one by one
+                for info, elf_path in pending:
+                    try:
+                        if not _symbol_file_loaded(elf_path):
+                            gdb.execute(f"add-symbol-file {elf_path}", to_string=True)
+                        info['loaded'] = True
+                        loaded += 1
+                    except gdb.error:
+                        errors += 1
+
         print(f"[ProtonOS] Loaded {loaded} symbols ({errors} errors).")
 
 class ProtonJitClearCommand(gdb.Command):
@@ -700,11 +1149,11 @@ class ProtonJitClearCommand(gdb.Command):
         super().__init__("proton-jit-clear", gdb.COMMAND_USER)
 
     def invoke(self, arg, from_tty):
-        global _jit_symbols, _temp_dir
+        global _temp_dir
 
         # Clear symbols
         count = len(_jit_symbols)
-        _jit_symbols = {}
+        _forget_jit_state()
 
         # Clean up temp directory
         if _temp_dir and os.path.exists(_temp_dir):
@@ -719,16 +1168,21 @@ ProtonConnectCommand()
 ProtonLoadSymbolsCommand()
 ProtonInfoCommand()
 ProtonJitScanCommand()
+ProtonJitEnableCommand()
 ProtonJitPauseCommand()
 ProtonJitListCommand()
 ProtonJitSearchCommand()
 ProtonJitLoadCommand()
 ProtonJitClearCommand()
 
+if not os.path.exists(KERNEL_SYMS):
+    print(f"[ProtonOS] Warning: {KERNEL_SYMS} not found - build the kernel before loading symbols")
+
 print("[ProtonOS] GDB helper loaded. Commands available:")
-print("  proton-connect [port]  - Connect to QEMU and load symbols automatically")
+print("  proton-connect [port] [--async] - Connect to QEMU and load symbols (--async: then continue &)")
 print("  proton-load-symbols    - Load symbols (if ImageBase already available)")
 print("  proton-jit-scan        - Scan for JIT methods (pauses target, no overhead)")
+print("  proton-jit-enable [off] - Record JIT methods as they are registered")
 print("  proton-jit-list        - Show count of scanned JIT methods")
 print("  proton-jit-search <p>  - Search JIT methods by pattern")
 print("  proton-jit-load [pat]  - Load JIT symbols into GDB")
@@ -1,207 +1,342 @@
 #!/usr/bin/env python3
 import sys
+import concurrent.futures
+import io
+import itertools
+import operator
 import re
 import subprocess
 import struct
 
-pdb_file = sys.argv[1]
-output_file = sys.argv[2]
+# Usage: gen_elf_syms.py [--jit-interface] <pdb> <output|->
+for_jit = '--jit-interface' in sys.argv[1:]
+pdb_file, output_file = [arg for arg in sys.argv[1:] if arg != '--jit-interface'][:2]
 IMAGE_BASE = 0x140000000
+ET_REL = 1
+ET_EXEC = 2
 
-# Get section info from PDB
-sections = {}
-result = subprocess.run(['llvm-pdbutil', 'dump', '--section-headers', pdb_file], 
-                       capture_output=True)
-section_num = 0
-for line in result.stdout.decode('utf-8', errors='replace').split('\n'):
-    if 'SECTION HEADER #' in line:
-        section_num = int(line.split('#')[1].strip())
-    if 'virtual address' in line:
-        va = int(line.split()[0], 16)
-        sections[section_num] = va
-
-# Get symbols from module 1
-result = subprocess.run(['llvm-pdbutil', 'dump', '--modi=1', '--symbols', pdb_file],
-                       capture_output=True)
+# CodeView symbol record kinds
+S_GDATA32 = 0x110D
+S_PUB32 = 0x110E
+S_GPROC32 = 0x1110
+S_GPROC32_ID = 0x1147
+
+MSF_MAGIC = b'Microsoft C/C++ MSF 7.00\r\n\x1aDS\x00\x00\x00'
+DBI_STREAM = 3
+DBG_SECTION_HDR = 5  # Index of the section header stream in the DBI optional debug header
+KERNEL_MODULE = 1  # Module whose symbols are dumped (same as llvm-pdbutil --modi=1)
+
+# llvm-pdbutil dump patterns (fallback path): record kind + name, then the
+# address (and code size, for procedures) on the following line; section
+# header numbers
+RECORD_RE = re.compile(r'\| (S_GPROC32|S_GDATA32|S_PUB32)\w* \[size = \d+\] `([^`]+)`')
+ADDR_RE = re.compile(r'addr = (\d+):(\d+)(?:.*code size = (\d+))?')
+SECTION_HEADER_PREFIX = 'SECTION HEADER #'
+
+ELF64_SYM = struct.Struct('<IBBHQQ')
+ELF64_SHDR = struct.Struct('<IIQQQQIIQQ')
+
+
+def read_msf_streams(data):
+    """Return a function reading stream N out of an MSF 7.00 (PDB) file image."""
+    if data[:len(MSF_MAGIC)] != MSF_MAGIC:
+        raise ValueError('not an MSF 7.00 file')
+    block_size, _, _, dir_bytes, _, block_map_addr = struct.unpack_from('<6I', data, len(MSF_MAGIC))
+
+    def blocks(indices, size):
+        return b''.join(data[b * block_size:(b + 1) * block_size] for b in indices)[:size]
+
+    def block_count(size):
+        return (size + block_size - 1) // block_size
+
+    dir_blocks = struct.unpack_from(f'<{block_count(dir_bytes)}I', data, block_map_addr * block_size)
+    directory = blocks(dir_blocks, dir_bytes)
+    num_streams = struct.unpack_from('<I', directory, 0)[0]
+    sizes = struct.unpack_from(f'<{num_streams}I', directory, 4)
+    pos = 4 + 4 * num_streams
+    stream_blocks = []
+    for size in sizes:
+        if size == 0xFFFFFFFF:  # Nil stream
+            size = 0
+        count = block_count(size)
+        stream_blocks.append((struct.unpack_from(f'<{count}I', directory, pos), size))
+        pos += 4 * count
+
+    def stream(index):
+        indices, size = stream_blocks[index]
+        return blocks(indices, size)
+    return stream
+
+
+def iter_records(buf, start=0, end=None):
+    """Yield (kind, offset) for each CodeView symbol record in buf[start:end]."""
+    end = len(buf) if end is None else end
+    pos = start
+    while pos + 4 <= end:
+        length, kind = struct.unpack_from('<HH', buf, pos)
+        yield kind, pos
+        pos += 2 + length
+
+
+def record_name(buf, pos):
+    """Read the null-terminated name of a symbol record."""
+    return buf[pos:buf.index(b'\x00', pos)].decode('utf-8', errors='replace')
+
+
+def read_pdb_native(pdb_file):
+    """Read section VAs and symbol records by walking the PDB's streams directly.
+
+    Returns (sections, procs, datas, publics): section number -> VA, and
+    (section, offset, size, name) / (section, offset, name) / (section, offset,
+    name) tuples for S_GPROC32 and S_GDATA32 in module 1 and S_PUB32 in the
+    publics table, in the same order llvm-pdbutil dumps them.
+    """
+    with open(pdb_file, 'rb') as f:
+        stream = read_msf_streams(f.read())
+
+    # DBI header: symbol record stream index, then the substream sizes
+    dbi = stream(DBI_STREAM)
+    publics_stream, _, sym_record_stream = struct.unpack_from('<HHH', dbi, 16)
+    (mod_info_size, sec_contrib_size, sec_map_size, file_info_size,
+     type_server_map_size, _, dbg_header_size, ec_size) = struct.unpack_from('<iiiiiIii', dbi, 24)
+
+    # Section headers (IMAGE_SECTION_HEADER, VirtualAddress at +12) via the optional debug header
+    dbg_header = 64 + mod_info_size + sec_contrib_size + sec_map_size + file_info_size + type_server_map_size + ec_size
+    if dbg_header_size < 2 * (DBG_SECTION_HDR + 1):
+        raise ValueError('no section header stream')
+    shdrs = stream(struct.unpack_from('<H', dbi, dbg_header + 2 * DBG_SECTION_HDR)[0])
+    sections = {i + 1: struct.unpack_from('<I', shdrs, i * 40 + 12)[0] for i in range(len(shdrs) // 40)}
+
+    # Skip to the kernel module's ModInfo: fixed 64 bytes, two names, 4-byte aligned
+    pos = 64
+    for _ in range(KERNEL_MODULE):
+        pos = dbi.index(b'\x00', dbi.index(b'\x00', pos + 64) + 1) + 1
+        pos = (pos + 3) & ~3
+    mod_stream, mod_sym_bytes = struct.unpack_from('<HI', dbi, pos + 34)
+    mod = stream(mod_stream)
+
+    procs = []
+    datas = []
+    for kind, rec in iter_records(mod, 4, mod_sym_bytes):  # Skip the CV signature
+        if kind == S_GPROC32 or kind == S_GPROC32_ID:
+            size, = struct.unpack_from('<I', mod, rec + 16)
+            offset, section = struct.unpack_from('<IH', mod, rec + 32)
+            procs.append((section, offset, size, record_name(mod, rec + 39)))
+        elif kind == S_GDATA32:
+            offset, section = struct.unpack_from('<IH', mod, rec + 8)
+            datas.append((section, offset, record_name(mod, rec + 14)))
+
+    # Publics: the GSI hash records (after the 28-byte publics header and the
+    # 16-byte hash header) point (offset + 1) into the symbol record stream
+    records = stream(sym_record_stream)
+    pub = stream(publics_stream)
+    hash_records_size = struct.unpack_from('<I', pub, 28 + 8)[0]
+    publics = []
+    for rec_plus_one, _ in struct.iter_unpack('<iI', pub[28 + 16:28 + 16 + hash_records_size]):
+        rec = rec_plus_one - 1
+        if struct.unpack_from('<H', records, rec + 2)[0] == S_PUB32:
+            offset, section = struct.unpack_from('<IH', records, rec + 8)
+            publics.append((section, offset, record_name(records, rec + 14)))
+
+    return sections, procs, datas, publics
+
+
+def pdbutil_dump(pdb_file, *options):
+    """Yield the lines of an llvm-pdbutil dump as the tool produces them."""
+    with subprocess.Popen(['llvm-pdbutil', 'dump', *options, pdb_file],
+                          stdout=subprocess.PIPE, bufsize=1024 * 1024) as proc:
+        yield from io.TextIOWrapper(proc.stdout, encoding='utf-8', errors='replace')
+
+
+def parse_section_headers_dump(pdb_file):
+    """Map section number -> VA from llvm-pdbutil's section header dump."""
+    sections = {}
+    section_num = 0
+    # Only two line shapes matter: "SECTION HEADER #N" and "<hex> virtual address"
+    for line in pdbutil_dump(pdb_file, '--section-headers'):
+        line = line.strip()
+        if line.startswith(SECTION_HEADER_PREFIX):
+            section_num = int(line[len(SECTION_HEADER_PREFIX):])
+        elif line.endswith(' virtual address'):
+            va = int(line.split()[0], 16)
+            sections[section_num] = va
+    return sections
+
+
+def parse_symbols_dump(pdb_file):
+    """Collect (procs, datas, publics) records from llvm-pdbutil's symbol dump."""
+    # Symbols from module 1 and the public symbols (includes native symbols
+    # from .asm files) in one dump, parsed while llvm-pdbutil is still writing it
+    procs = []
+    datas = []
+    publics = []
+    record = None
+    for line in pdbutil_dump(pdb_file, '--modi=1', '--symbols', '--publics'):
+        # Format: offset | S_xxx [size = N] `name`
+        # Next line has: ..., addr = section:offset[, code size = N]
+        addr_match = ADDR_RE.search(line) if record else None
+        if addr_match:
+            kind, name = record.groups()
+            section = int(addr_match.group(1))
+            offset = int(addr_match.group(2))
+            if kind == 'S_GPROC32':
+                size = int(addr_match.group(3)) if addr_match.group(3) else 0
+                procs.append((section, offset, size, name))
+            elif kind == 'S_GDATA32':
+                # Global data symbols (e.g., __jit_debug_descriptor)
+                datas.append((section, offset, name))
+            else:
+                publics.append((section, offset, name))
+        record = RECORD_RE.search(line)
+    return procs, datas, publics
+
+
+def read_pdb_with_pdbutil(pdb_file):
+    """Same as read_pdb_native(), but parsed from llvm-pdbutil's text dumps."""
+    # The two dumps are independent, so run (and parse) them concurrently;
+    # the threads mostly wait on llvm-pdbutil's output pipes
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+        sections = pool.submit(parse_section_headers_dump, pdb_file)
+        symbols = pool.submit(parse_symbols_dump, pdb_file)
+        procs, datas, publics = symbols.result()
+        return sections.result(), procs, datas, publics
+
+
+def emit_elf(symbols, data_symbols, *, for_jit=False):
+    """Build the symbol-only ELF image for the given (addr, size, name) lists.
+
+    The default is the ET_EXEC file loaded with add-symbol-file. With for_jit
+    the image is an ET_REL object, the form GDB's JIT interface expects for
+    in-memory symbol files.
+    """
+    # Merge data symbols into symbols list (will be marked as OBJECT type)
+    all_symbols = symbols + data_symbols
+
+    # Build string table for section names
+    shstrtab = b'\x00.text\x00.symtab\x00.strtab\x00.shstrtab\x00'
+    # Offsets: .text=1, .symtab=7, .strtab=15, .shstrtab=23
+
+    # Build string table for symbols (include both functions and data)
+    # in one join, with each name's offset taken from a running sum of lengths.
+    # Names are interned: symbols sharing a name share one strtab entry.
+    unique_names = list(dict.fromkeys(name for _, _, name in all_symbols))
+    encoded = [name.encode('utf-8', errors='replace') for name in unique_names]
+    offsets = itertools.accumulate((len(e) + 1 for e in encoded), initial=1)
+    str_offsets = dict(zip(unique_names, offsets))
+    strtab = b'\x00'.join([b'', *encoded, b''])
+
+    # ELF64 header
+    ehdr = bytearray(64)
+    ehdr[0:4] = b'\x7fELF'
+    ehdr[4] = 2  # ELFCLASS64
+    ehdr[5] = 1  # ELFDATA2LSB
+    ehdr[6] = 1  # EV_CURRENT
+    struct.pack_into('<H', ehdr, 16, ET_REL if for_jit else ET_EXEC)  # e_type
+    struct.pack_into('<H', ehdr, 18, 62)  # e_machine = EM_X86_64
+    struct.pack_into('<I', ehdr, 20, 1)  # e_version
+    struct.pack_into('<Q', ehdr, 24, 0 if for_jit else IMAGE_BASE + 0x3d000)  # e_entry (none for ET_REL)
+    struct.pack_into('<Q', ehdr, 32, 0)  # e_phoff
+    struct.pack_into('<Q', ehdr, 40, 64)  # e_shoff
+    struct.pack_into('<H', ehdr, 52, 64)  # e_ehsize
+    struct.pack_into('<H', ehdr, 58, 64)  # e_shentsize
+    struct.pack_into('<H', ehdr, 60, 5)  # e_shnum
+    struct.pack_into('<H', ehdr, 62, 4)  # e_shstrndx
+
+    # Section header offset calculations
+    shdrs_size = 5 * 64  # 5 sections
+    text_offset = 64 + shdrs_size
+    symtab_offset = text_offset  # Empty text section
+    strtab_offset = symtab_offset + (len(all_symbols) + 1) * 24
+    shstrtab_offset = strtab_offset + len(strtab)
+
+    # Section headers, one Elf64_Shdr pack each:
+    # sh_name, sh_type, sh_flags, sh_addr, sh_offset, sh_size, sh_link, sh_info, sh_addralign, sh_entsize
+    # 0: NULL
+    shdr_null = bytes(ELF64_SHDR.size)
+
+    # 1: .text (empty but defines the address range); ALLOC | EXEC, no actual content.
+    # ET_REL symbol values are section-relative, so the JIT image puts .text at 0
+    # and the absolute st_values below stay absolute.
+    text_addr = 0 if for_jit else IMAGE_BASE + 0x3d000
+    shdr_text = ELF64_SHDR.pack(1, 1, 6, text_addr, text_offset, 0, 0, 0, 0, 0)
+
+    # 2: .symtab; sh_link = strtab, sh_info = first global
+    shdr_symtab = ELF64_SHDR.pack(7, 2, 0, 0, symtab_offset, (len(all_symbols) + 1) * 24, 3, 1, 0, 24)
+
+    # 3: .strtab
+    shdr_strtab = ELF64_SHDR.pack(15, 3, 0, 0, strtab_offset, len(strtab), 0, 0, 0, 0)
+
+    # 4: .shstrtab
+    shdr_shstrtab = ELF64_SHDR.pack(23, 3, 0, 0, shstrtab_offset, len(shstrtab), 0, 0, 0, 0)
+
+    # Build symbol table
+    # Create set of function symbol names for type detection
+    func_names = {name for addr, size, name in symbols}
+
+    # Preallocated with the null symbol at index 0; one pack per Elf64_Sym
+    symtab = bytearray(ELF64_SYM.size * (len(all_symbols) + 1))
+    # Sorted by address only: integer compares, not whole tuples with long names
+    for i, (addr, size, name) in enumerate(sorted(all_symbols, key=operator.itemgetter(0)), start=1):
+        if name in func_names:
+            st_info = (1 << 4) | 2  # GLOBAL | FUNC
+        else:
+            st_info = (1 << 4) | 1  # GLOBAL | OBJECT (data symbol)
+        # st_name, st_info, st_other, st_shndx = .text section, st_value, st_size
+        ELF64_SYM.pack_into(symtab, i * ELF64_SYM.size, str_offsets[name], st_info, 0, 1, addr, size)
+
+    return b''.join((ehdr, shdr_null, shdr_text, shdr_symtab, shdr_strtab, shdr_shstrtab,
+                     symtab, strtab, shstrtab))
+
+
+# Status goes to stderr when the image itself is written to stdout
+to_stdout = output_file == '-'
+log = sys.stderr if to_stdout else sys.stdout
+
+# Read the PDB directly; llvm-pdbutil is only needed if that fails
+try:
+    records = read_pdb_native(pdb_file)
+except (ValueError, IndexError, struct.error) as e:
+    print(f"Direct PDB read failed ({e}), falling back to llvm-pdbutil", file=log)
+    records = read_pdb_with_pdbutil(pdb_file)
+sections, procs, datas, publics = records
 
 symbols = []
 data_symbols = []  # For global data like __jit_debug_descriptor
-lines = result.stdout.decode('utf-8', errors='replace').split('\n')
-i = 0
-while i < len(lines):
-    line = lines[i]
-    if 'S_GPROC32' in line:
-        match = re.search(r'`([^`]+)`', line)
-        if match:
-            name = match.group(1)
-            if i + 1 < len(lines):
-                addr_line = lines[i + 1]
-                addr_match = re.search(r'addr = (\d+):(\d+)', addr_line)
-                size_match = re.search(r'code size = (\d+)', addr_line)
-                if addr_match:
-                    section = int(addr_match.group(1))
-                    offset = int(addr_match.group(2))
-                    size = int(size_match.group(1)) if size_match else 0
-                    if section in sections:
-                        addr = IMAGE_BASE + sections[section] + offset
-                        symbols.append((addr, size, name))
-    elif 'S_GDATA32' in line:
-        # Global data symbols (e.g., __jit_debug_descriptor)
-        match = re.search(r'`([^`]+)`', line)
-        if match:
-            name = match.group(1)
-            if i + 1 < len(lines):
-                addr_line = lines[i + 1]
-                addr_match = re.search(r'addr = (\d+):(\d+)', addr_line)
-                if addr_match:
-                    section = int(addr_match.group(1))
-                    offset = int(addr_match.group(2))
-                    if section in sections:
-                        addr = IMAGE_BASE + sections[section] + offset
-                        data_symbols.append((addr, 0, name))
-    i += 1
-
-# Also get public symbols (includes native symbols from .asm files)
-result = subprocess.run(['llvm-pdbutil', 'dump', '--publics', pdb_file],
-                       capture_output=True)
-lines = result.stdout.decode('utf-8', errors='replace').split('\n')
-
-# Track existing symbol names to avoid duplicates
+for section, offset, size, name in procs:
+    if name and section in sections:
+        symbols.append((IMAGE_BASE + sections[section] + offset, size, name))
+for section, offset, name in datas:
+    if name and section in sections:
+        data_symbols.append((IMAGE_BASE + sections[section] + offset, 0, name))
+
+# Track existing symbol names to avoid duplicates. Publics that alias an
+# existing address under a different name (e.g. RuntimeExport/EntryPoint names
+# next to the mangled S_GPROC32) are kept so both names resolve.
 existing_names = {name for _, _, name in symbols} | {name for _, _, name in data_symbols}
 
-for line in lines:
-    if 'S_PUB32' in line:
-        # Format: offset | S_PUB32 [size = N] `name`
-        # Next line has: flags = ..., addr = section:offset
-        match = re.search(r'`([^`]+)`', line)
-        if match:
-            name = match.group(1)
-            # Skip if we already have this symbol
-            if name in existing_names:
-                continue
-            # Skip internal/compiler-generated symbols
-            if name.startswith('__Str__') or name.startswith('_unwind'):
-                continue
-            # Look for addr in next non-empty line
-            idx = lines.index(line)
-            if idx + 1 < len(lines):
-                next_line = lines[idx + 1]
-                addr_match = re.search(r'addr = (\d+):(\d+)', next_line)
-                if addr_match:
-                    section = int(addr_match.group(1))
-                    offset = int(addr_match.group(2))
-                    if section in sections:
-                        addr = IMAGE_BASE + sections[section] + offset
-                        # Determine if function or data based on name pattern
-                        if name.startswith('__jit_debug_descriptor') or name.startswith('g_'):
-                            data_symbols.append((addr, 0, name))
-                        else:
-                            symbols.append((addr, 0, name))
-                        existing_names.add(name)
-
-# Merge data symbols into symbols list (will be marked as OBJECT type)
-all_symbols = symbols + data_symbols
-
-# Build string table for section names
-shstrtab = b'\x00.text\x00.symtab\x00.strtab\x00.shstrtab\x00'
-# Offsets: .text=1, .symtab=7, .strtab=15, .shstrtab=23
-
-# Build string table for symbols (include both functions and data)
-strtab = b'\x00'
-str_offsets = {}
-for addr, size, name in all_symbols:
-    str_offsets[name] = len(strtab)
-    strtab += name.encode('utf-8', errors='replace') + b'\x00'
-
-# ELF64 header
-ehdr = bytearray(64)
-ehdr[0:4] = b'\x7fELF'
-ehdr[4] = 2  # ELFCLASS64
-ehdr[5] = 1  # ELFDATA2LSB
-ehdr[6] = 1  # EV_CURRENT
-struct.pack_into('<H', ehdr, 16, 2)  # e_type = ET_EXEC
-struct.pack_into('<H', ehdr, 18, 62)  # e_machine = EM_X86_64
-struct.pack_into('<I', ehdr, 20, 1)  # e_version
-struct.pack_into('<Q', ehdr, 24, IMAGE_BASE + 0x3d000)  # e_entry
-struct.pack_into('<Q', ehdr, 32, 0)  # e_phoff
-struct.pack_into('<Q', ehdr, 40, 64)  # e_shoff
-struct.pack_into('<H', ehdr, 52, 64)  # e_ehsize
-struct.pack_into('<H', ehdr, 58, 64)  # e_shentsize
-struct.pack_into('<H', ehdr, 60, 5)  # e_shnum
-struct.pack_into('<H', ehdr, 62, 4)  # e_shstrndx
-
-# Section header offset calculations
-shdrs_size = 5 * 64  # 5 sections
-text_offset = 64 + shdrs_size
-symtab_offset = text_offset  # Empty text section
-strtab_offset = symtab_offset + (len(all_symbols) + 1) * 24
-shstrtab_offset = strtab_offset + len(strtab)
-
-# Section headers
-# 0: NULL
-shdr_null = bytes(64)
-
-# 1: .text (empty but defines the address range)
-shdr_text = bytearray(64)
-struct.pack_into('<I', shdr_text, 0, 1)  # sh_name = ".text"
-struct.pack_into('<I', shdr_text, 4, 1)  # sh_type = SHT_PROGBITS
-struct.pack_into('<Q', shdr_text, 8, 6)  # sh_flags = ALLOC | EXEC
-struct.pack_into('<Q', shdr_text, 16, IMAGE_BASE + 0x3d000)  # sh_addr
-struct.pack_into('<Q', shdr_text, 24, text_offset)  # sh_offset
-struct.pack_into('<Q', shdr_text, 32, 0)  # sh_size (no actual content)
-
-# 2: .symtab
-shdr_symtab = bytearray(64)
-struct.pack_into('<I', shdr_symtab, 0, 7)  # sh_name = ".symtab"
-struct.pack_into('<I', shdr_symtab, 4, 2)  # sh_type = SHT_SYMTAB
-struct.pack_into('<Q', shdr_symtab, 24, symtab_offset)
-struct.pack_into('<Q', shdr_symtab, 32, (len(all_symbols)+1)*24)
-struct.pack_into('<I', shdr_symtab, 40, 3)  # sh_link = strtab
-struct.pack_into('<I', shdr_symtab, 44, 1)  # sh_info = first global
-struct.pack_into('<Q', shdr_symtab, 56, 24)
-
-# 3: .strtab
-shdr_strtab = bytearray(64)
-struct.pack_into('<I', shdr_strtab, 0, 15)  # sh_name = ".strtab"
-struct.pack_into('<I', shdr_strtab, 4, 3)  # sh_type = SHT_STRTAB
-struct.pack_into('<Q', shdr_strtab, 24, strtab_offset)
-struct.pack_into('<Q', shdr_strtab, 32, len(strtab))
-
-# 4: .shstrtab
-shdr_shstrtab = bytearray(64)
-struct.pack_into('<I', shdr_shstrtab, 0, 23)  # sh_name = ".shstrtab"
-struct.pack_into('<I', shdr_shstrtab, 4, 3)  # sh_type = SHT_STRTAB
-struct.pack_into('<Q', shdr_shstrtab, 24, shstrtab_offset)
-struct.pack_into('<Q', shdr_shstrtab, 32, len(shstrtab))
-
-# Build symbol table
-# Create set of function symbol names for type detection
-func_names = {name for addr, size, name in symbols}
-
-symtab = bytearray(24)  # Null symbol
-for addr, size, name in sorted(all_symbols):
-    sym = bytearray(24)
-    struct.pack_into('<I', sym, 0, str_offsets[name])
-    if name in func_names:
-        sym[4] = (1 << 4) | 2  # GLOBAL | FUNC
-    else:
-        sym[4] = (1 << 4) | 1  # GLOBAL | OBJECT (data symbol)
-    sym[5] = 0  # st_other
-    struct.pack_into('<H', sym, 6, 1)  # st_shndx = .text section
-    struct.pack_into('<Q', sym, 8, addr)
-    struct.pack_into('<Q', sym, 16, size)
-    symtab += sym
-
-# Write
-with open(output_file, 'wb') as f:
-    f.write(ehdr)
-    f.write(shdr_null)
-    f.write(shdr_text)
-    f.write(shdr_symtab)
-    f.write(shdr_strtab)
-    f.write(shdr_shstrtab)
-    f.write(symtab)
-    f.write(strtab)
-    f.write(shstrtab)
-
-print(f"Generated {output_file} with {len(symbols)} functions and {len(data_symbols)} data symbols")
+# Public symbols (includes native symbols from .asm files)
+for section, offset, name in publics:
+    # Skip if we already have this symbol
+    if not name or name in existing_names:
+        continue
+    # Skip internal/compiler-generated symbols
+    if name.startswith('__Str__') or name.startswith('_unwind'):
+        continue
+    if section in sections:
+        addr = IMAGE_BASE + sections[section] + offset
+        # Determine if function or data based on name pattern
+        if name.startswith('__jit_debug_descriptor') or name.startswith('g_'):
+            data_symbols.append((addr, 0, name))
+        else:
+            symbols.append((addr, 0, name))
+        existing_names.add(name)
+
+# Write the whole image in one call ('-' writes it to stdout)
+image = emit_elf(symbols, data_symbols, for_jit=for_jit)
+if to_stdout:
+    sys.stdout.buffer.write(image)
+else:
+    with open(output_file, 'wb') as f:
+        f.write(image)
+
+print(f"Generated {output_file} with {len(symbols)} functions and {len(data_symbols)} data symbols", file=log)